@@ -0,0 +1,45 @@
+"""bump todo_list_version in a trigger
+
+Revision ID: 6240332eea87
+Revises: 0a9ab56f4b32
+Create Date: 2026-10-15 15:02:37.884106
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6240332eea87'
+down_revision: Union[str, Sequence[str], None] = '0a9ab56f4b32'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Every statement that changes todos bumps the list version inside the same transaction
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_todo_list_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE todo_list_version SET version = version + 1 WHERE id = 1;
+            IF NOT FOUND THEN
+                RAISE EXCEPTION 'todo_list_version row is missing; run the Alembic migrations';
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER todos_bump_list_version
+        AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON todos
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_todo_list_version()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS todos_bump_list_version ON todos")
+    op.execute("DROP FUNCTION IF EXISTS bump_todo_list_version()")
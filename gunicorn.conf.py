@@ -0,0 +1,18 @@
+# Gunicorn settings for production:  gunicorn main:app -c gunicorn.conf.py
+# Each worker is a separate process with its own DB pool and OpenAI client.
+# main.py sizes each pool from DB_MAX_CONNECTIONS / WEB_CONCURRENCY, so the workers together stay under it.
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+
+# One uvicorn event loop per process; uvicorn picks up uvloop and httptools when installed
+worker_class = "uvicorn.workers.UvicornWorker"
+# Every worker holds at least one DB connection, so the default never exceeds DB_MAX_CONNECTIONS
+# (cpu_count() reports the host's CPUs inside containers, which can be far more than the DB allows)
+db_max_connections = int(os.environ.get("DB_MAX_CONNECTIONS", "90"))  # same default as main.py
+workers = int(os.environ.get("WEB_CONCURRENCY", min(multiprocessing.cpu_count() * 2 + 1, db_max_connections)))
+os.environ["WEB_CONCURRENCY"] = str(workers)  # Inherited by the workers, which size their DB pools from it
+
+worker_tmp_dir = "/dev/shm"  # Heartbeat files in memory, not on a (possibly slow) disk
+timeout = 60                 # Leave room for slow LLM calls before a worker is killed
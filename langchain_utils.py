@@ -1,7 +1,17 @@
 # ✅ 1. Import necessary modules
 import os                             # To read environment variables
+import asyncio                        # For async coordination of concurrent LLM calls
+import hashlib                        # To build stable cache keys from task lists
+from collections import OrderedDict   # Small in-process LRU cache for LLM responses
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from functools import lru_cache       # To build the LLM once, on first use
+import httpx                          # Shared HTTP clients with keep-alive for OpenAI calls
 from dotenv import load_dotenv       # To load variables from .env during local dev
 from pydantic import SecretStr
+from aiolimiter import AsyncLimiter   # Token-bucket rate limiter for OpenAI requests
+import redis                          # Shared answer cache across worker processes
+import redis.asyncio
 
 # # ✅ 2. LangChain modules for chat, prompts, and chaining
 # from langchain_community.chat_models import ChatOpenAI       # Wraps OpenAI's chat models
@@ -26,36 +36,288 @@ if not openai_api_key:
     raise ValueError("OPENAI_API_KEY environment variable not set")
 
 
-# Create the OpenAI chat model object with LangChain
-llm = ChatOpenAI(
-    model="gpt-4",          # You can switch to "gpt-4" if you need better reasoning
-    temperature=0.7,                # Creativity control: 0 = strict, 1 = random
-    api_key=SecretStr(openai_api_key)   # Secure API key injection
-)
+# ✅ Connection limits shared by the sync and async OpenAI HTTP clients
+OPENAI_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+
+# Create the OpenAI chat model object with LangChain (once per process, on first use)
+@lru_cache(maxsize=None)
+def get_llm() -> ChatOpenAI:
+    """
+    Build the chat model with pooled HTTP/2 clients, so calls reuse TCP/TLS connections.
+    """
+    return ChatOpenAI(
+        model="gpt-4o-mini",    # Fast and cheap; plenty for ordering a task list (switch to "gpt-4o" for better reasoning)
+        temperature=0.3,                # Creativity control: 0 = strict, 1 = random (low = consistent rankings)
+        max_tokens=512,                 # Cap the answer length so a runaway generation can't inflate latency
+        timeout=20,                     # Seconds before giving up on an OpenAI request (applies per request, over the httpx clients)
+        api_key=SecretStr(openai_api_key),   # Secure API key injection
+        http_client=httpx.Client(http2=True, limits=OPENAI_HTTP_LIMITS),
+        http_async_client=httpx.AsyncClient(http2=True, limits=OPENAI_HTTP_LIMITS),
+    )
+
+
+async def close_llm() -> None:
+    """
+    Close the LLM's HTTP clients, if it was ever built (call on shutdown).
+    """
+    if get_llm.cache_info().currsize:
+        llm = get_llm()
+        await llm.http_async_client.aclose()
+        llm.http_client.close()
+        get_llm.cache_clear()
+        get_priority_chain.cache_clear()
+
 
 # ✅ Define a reusable PromptTemplate
+# The static instructions come first and {tasks} last, so every request shares the
+# same prompt prefix and OpenAI's server-side prompt cache can reuse it.
 priority_prompt = PromptTemplate.from_template("""
 You are a productivity assistant. Your job is to help prioritize tasks.
+Return a numbered list of these tasks ordered from most to least important, with a short explanation for each.
+Be helpful and concise.
 
 Here is a list of tasks:
 {tasks}
-
-Return a numbered list of these tasks ordered from most to least important, with a short explanation for each.
-Be helpful and concise.
 """)
 
 # Combine prompt and LLM into a chain object (Chain Prompt → LLM using the pipe syntax)
-priority_chain: Runnable = priority_prompt | llm
+@lru_cache(maxsize=None)
+def get_priority_chain() -> Runnable:
+    return priority_prompt | get_llm()
 
 
-# ✅ 8. Function to be used in our FastAPI route
-def get_task_priorities(task_list: list[str]) -> str:
+# ✅ Cache of LLM answers, so identical task lists don't hit OpenAI again.
+# Each process keeps a small LRU in front of Redis, which every Gunicorn/Celery worker shares.
+PRIORITY_CACHE_MAXSIZE = 1024
+PRIORITY_CACHE_TTL = int(os.getenv("PRIORITY_CACHE_TTL", "3600"))  # seconds an answer stays in Redis
+CACHE_REDIS_URL = os.getenv("REDIS_URL")  # Without it, only the per-process LRU is used
+_priority_cache: OrderedDict[str, str] = OrderedDict()
+
+# Short timeouts: when Redis is down, a lookup becomes a cache miss instead of a stall
+_REDIS_OPTIONS = dict(decode_responses=True, socket_connect_timeout=0.5, socket_timeout=0.5)
+
+
+@lru_cache(maxsize=None)
+def _redis_client() -> redis.Redis | None:
+    return redis.Redis.from_url(CACHE_REDIS_URL, **_REDIS_OPTIONS) if CACHE_REDIS_URL else None
+
+
+@lru_cache(maxsize=None)
+def _redis_async_client() -> redis.asyncio.Redis | None:
+    return redis.asyncio.Redis.from_url(CACHE_REDIS_URL, **_REDIS_OPTIONS) if CACHE_REDIS_URL else None
+
+
+def _cache_key(task_list: list[str]) -> str:
+    """
+    Build a stable key for a task list: order, case and surrounding whitespace don't matter.
+    """
+    normalized = "\n".join(sorted(task.strip().lower() for task in task_list))
+    return hashlib.blake2b(normalized.encode()).hexdigest()
+
+
+def _cache_get(key: str) -> str | None:
+    if key not in _priority_cache:
+        return None
+    _priority_cache.move_to_end(key)  # Mark as most recently used
+    return _priority_cache[key]
+
+
+def _cache_put(key: str, content: str) -> None:
+    _priority_cache[key] = content
+    if len(_priority_cache) > PRIORITY_CACHE_MAXSIZE:
+        _priority_cache.popitem(last=False)  # Evict the least recently used entry
+
+
+def _lookup(key: str) -> str | None:
+    """
+    Find a cached answer in this process, then in Redis.
+    """
+    cached = _cache_get(key)
+    client = _redis_client()
+    if cached is None and client is not None:
+        try:
+            cached = client.get(f"priorities:{key}")
+        except redis.RedisError:
+            return None
+        if cached is not None:
+            _cache_put(key, cached)
+    return cached
+
+
+async def _alookup(key: str) -> str | None:
+    """
+    Async version of _lookup, for the FastAPI routes.
+    """
+    cached = _cache_get(key)
+    client = _redis_async_client()
+    if cached is None and client is not None:
+        try:
+            cached = await client.get(f"priorities:{key}")
+        except redis.RedisError:
+            return None
+        if cached is not None:
+            _cache_put(key, cached)
+    return cached
+
+
+def _store(key: str, content: str) -> None:
+    _cache_put(key, content)
+    client = _redis_client()
+    if client is not None:
+        try:
+            client.set(f"priorities:{key}", content, ex=PRIORITY_CACHE_TTL)
+        except redis.RedisError:
+            pass  # Still cached in this process
+
+
+async def _astore(key: str, content: str) -> None:
+    _cache_put(key, content)
+    client = _redis_async_client()
+    if client is not None:
+        try:
+            await client.set(f"priorities:{key}", content, ex=PRIORITY_CACHE_TTL)
+        except redis.RedisError:
+            pass  # Still cached in this process
+
+
+async def close_cache() -> None:
+    """
+    Close the async Redis client, if it was ever built (call on shutdown).
+    """
+    if _redis_async_client.cache_info().currsize:
+        client = _redis_async_client()
+        if client is not None:
+            await client.aclose()
+        _redis_async_client.cache_clear()
+
+
+# ✅ Keep OpenAI traffic under the account's rate limits
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "10"))          # calls in flight per process
+LLM_REQUESTS_PER_MINUTE = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "60"))  # calls started per minute per process
+_llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+_llm_rate_limiter = AsyncLimiter(LLM_REQUESTS_PER_MINUTE, 60)
+
+# In-flight LLM calls by cache key, so identical concurrent requests share one call
+_pending: dict[str, asyncio.Task[str]] = {}
+
+
+@asynccontextmanager
+async def _llm_slot():
+    """
+    Wait for a free concurrency slot and rate-limit token before calling OpenAI.
+    """
+    async with _llm_semaphore, _llm_rate_limiter:
+        yield
+
+
+# Strong references to fire-and-forget tasks, so they aren't garbage-collected mid-flight
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _run_in_background(coro) -> asyncio.Task:
+    """
+    Start a task that keeps running even if the request that started it goes away.
+    """
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+
+    def _done(t: asyncio.Task) -> None:
+        _background_tasks.discard(t)
+        if not t.cancelled():
+            t.exception()  # Mark the error as retrieved: nobody may be left to await it
+
+    task.add_done_callback(_done)
+    return task
+
+
+def _format_tasks(task_list: list[str]) -> str:
+    """
+    Render tasks as a bullet list with a single join (no per-task f-string).
+    """
+    return "- " + "\n- ".join(task_list) if task_list else ""
+
+
+# ✅ 8. Function to be used in our FastAPI routes
+async def get_task_priorities_async(task_list: list[str]) -> str:
     """
     Given a list of tasks, use the LLM to return a prioritized and reasoned list.
+    Answers are cached per task list (see _cache_key).
+    """
+    key = _cache_key(task_list)
+    cached = await _alookup(key)
+    if cached is not None:
+        return cached
+
+    # One shared call per task list. It runs as its own task, not inside any request, so a cancelled
+    # request (client gone) doesn't cancel the call the other requests are waiting on; shield() keeps
+    # each request's cancellation from reaching the shared task.
+    call = _pending.get(key)
+    if call is None:
+        call = _run_in_background(_ask_llm(key, task_list))
+        _pending[key] = call
+        call.add_done_callback(lambda done: _pending.pop(key) if _pending.get(key) is done else None)
+    return await asyncio.shield(call)
+
+
+async def _ask_llm(key: str, task_list: list[str]) -> str:
+    formatted_tasks = _format_tasks(task_list)
+    async with _llm_slot():
+        result = await get_priority_chain().ainvoke({"tasks": formatted_tasks})  # Fill prompt and run model without blocking the event loop
+    content = result.content # Extract the content from the result
+
+    await _astore(key, content)
+    return content
+
+
+async def stream_task_priorities(task_list: list[str]) -> AsyncIterator[str]:
+    """
+    Same as get_task_priorities_async, but yields the answer piece by piece as the LLM produces it.
+    A cached answer is yielded in one piece; a complete streamed answer is added to the cache.
     """
-    formatted_tasks = "\n".join(f"- {task}" for task in task_list)  # Convert to string with bullet points
-    result = priority_chain.invoke({"tasks": formatted_tasks})  # Fill prompt and run model
-    return result.content # Extract the content from the result
+    key = _cache_key(task_list)
+    cached = await _alookup(key)
+    if cached is not None:
+        yield cached
+        return
+
+    # The LLM is read by a background task into a queue, so the concurrency slot is released as soon as
+    # OpenAI is done, however slowly the HTTP client reads. The queue is bounded by max_tokens.
+    queue: asyncio.Queue[str | None] = asyncio.Queue()
+
+    async def produce() -> None:
+        parts: list[str] = []
+        try:
+            async with _llm_slot():
+                async for chunk in get_priority_chain().astream({"tasks": _format_tasks(task_list)}):
+                    if chunk.content:
+                        parts.append(chunk.content)
+                        queue.put_nowait(chunk.content)
+            await _astore(key, "".join(parts))
+        finally:
+            queue.put_nowait(None)  # End of stream (also on error)
+
+    producer = _run_in_background(produce())
+    while (piece := await queue.get()) is not None:
+        yield piece
+    await producer  # Re-raise the LLM error, if there was one
+
+
+def get_task_priorities(task_list: list[str]) -> str:
+    """
+    Blocking version of get_task_priorities_async, for Celery workers and scripts.
+    Uses the sync HTTP and Redis clients, so it never touches an event loop (and shares the same cache).
+    """
+    key = _cache_key(task_list)
+    cached = _lookup(key)
+    if cached is not None:
+        return cached
+
+    result = get_priority_chain().invoke({"tasks": _format_tasks(task_list)})  # Fill prompt and run model
+    content = result.content
+
+    _store(key, content)
+    return content
 
 #---Example usage (not part of the module)---
 if __name__ == "__main__":
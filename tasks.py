@@ -0,0 +1,40 @@
+# ✅ Background jobs: LLM insights run on a Celery worker fleet instead of the web workers
+# Start a worker with:  celery -A tasks worker --concurrency=8
+import os
+from celery import Celery
+from langchain_utils import get_task_priorities
+
+# ✅ Redis is both the broker (job queue) and the result backend (job status / answers)
+REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")  # fallback for local dev
+
+celery_app = Celery(
+    "todo_tasks",
+    broker=os.environ.get("CELERY_BROKER_URL", REDIS_URL),
+    backend=os.environ.get("CELERY_RESULT_BACKEND", REDIS_URL),
+)
+celery_app.conf.update(
+    result_expires=3600,           # Keep finished job results for an hour
+    task_acks_late=True,           # Acknowledge a job only once it has run...
+    task_reject_on_worker_lost=True,  # ...and re-queue it if the worker process dies mid-call
+    worker_prefetch_multiplier=1,  # LLM calls are slow: don't let one worker hoard jobs
+    # The web app enqueues and polls from request handlers: when Redis is down, fail within
+    # a couple of seconds (the API answers 503) instead of holding a web thread for ~20s.
+    # delay() subscribes to the result backend before publishing, so both need short retries.
+    broker_connection_timeout=2,
+    broker_transport_options={"socket_connect_timeout": 2, "socket_timeout": 2},
+    task_publish_retry_policy={"max_retries": 1, "interval_start": 0, "interval_step": 0.5, "interval_max": 0.5},
+    result_backend_transport_options={
+        "retry_policy": {"max_retries": 1, "interval_start": 0, "interval_step": 0.5, "interval_max": 0.5},
+    },
+    redis_socket_connect_timeout=2,
+    redis_socket_timeout=2,
+)
+
+
+# Rate limit is per worker process, on top of OpenAI's own limits
+@celery_app.task(rate_limit=os.environ.get("LLM_TASK_RATE_LIMIT", "60/m"))
+def task_insights(tasks: list[str]) -> str:
+    """
+    Given a list of tasks, return the AI-generated prioritization.
+    """
+    return get_task_priorities(tasks)